@@ -6,7 +6,9 @@ Implements timeshift via monkey-patching (no modification to Dispatcharr source)
 2. Patches stream_xc to find channels by provider stream_id (for live streaming)
 3. Patches xc_get_epg to find channels by provider stream_id (for EPG/timeshift data)
 4. Patches generate_epg to convert XMLTV timestamps to local timezone (IPTVX fix)
-5. Patches URLResolver.resolve to intercept /timeshift/ URLs
+5. Prepends TimeshiftMiddleware to settings.MIDDLEWARE to intercept /timeshift/
+   URLs before resolution, with a URLResolver.resolve patch as fallback for
+   workers whose middleware chain was built before injection
 
 RUNTIME ENABLE/DISABLE:
     Hooks are installed once at startup (regardless of plugin enabled state).
@@ -26,8 +28,13 @@ WHY MONKEY-PATCHING?
        Dispatcharr has a catch-all pattern "<path:unused_path>" that matches
        everything. Even inserting before it didn't work reliably.
 
-    2. Middleware - FAILED
-       Middleware runs after URL resolution, so the catch-all already matched.
+    2. Middleware - NOW THE PRIMARY PATH (initially dismissed)
+       An early attempt failed, but a __call__-style middleware that
+       short-circuits with a response actually runs BEFORE URL resolution
+       (resolution happens inside get_response). We now inject
+       TimeshiftMiddleware at the front of settings.MIDDLEWARE; it only
+       takes effect in workers whose middleware chain is built after
+       injection, hence the resolver patch below stays as fallback.
 
     3. ROOT_URLCONF replacement - FAILED
        Django caches settings at startup, so changing ROOT_URLCONF had no effect.
@@ -50,22 +57,59 @@ GitHub: https://github.com/cedric-marcoux/dispatcharr_timeshift
 """
 
 import re
+import hmac
+import time
 import logging
+import threading
 
 logger = logging.getLogger("plugins.dispatcharr_timeshift.hooks")
 
+# URL pattern sent by iPlayTV for timeshift requests. Shared by the
+# middleware (primary interception point) and the URLResolver patch
+# (fallback). See _patch_url_resolver docstring for the parameter quirks.
+TIMESHIFT_PATTERN = re.compile(
+    r'^/?timeshift/(?P<username>[^/]+)/(?P<password>[^/]+)/'
+    r'(?P<stream_id>\d+)/(?P<timestamp>[\d\-:]+)/(?P<duration>\d+)\.ts$'
+)
+
+# Django objects prebound by _bind_django_objects() when install_hooks()
+# runs (Django apps are ready by then). Hot paths read these module globals
+# instead of re-executing `from X import Y` per call — sys.modules caching
+# still leaves a _find_and_load check plus attribute binding per import
+# statement. None until bound; users fall back to a local import so the
+# functions stay safe to call in isolation.
+_Channel = None
+_Stream = None
+_User = None
+_Prefetch = None
+_RawSQL = None
+_JsonResponse = None
+_get_object_or_404 = None
+
 # Store original functions for potential restoration
 _original_xc_get_live_streams = None
 _original_stream_xc = None
 _original_xc_get_epg = None
 _original_generate_epg = None
-_original_url_callbacks = {}
+# URL pattern objects whose callback we replaced (direct references, so
+# restore doesn't need to rescan urlpatterns)
+_patched_url_patterns = []
 _original_resolve = None
 
 
+# Snapshot cache for the parsed plugin config. Nearly every patched function
+# and timeshift_proxy itself call _get_plugin_config(), which used to mean a
+# PluginConfig JSON fetch + re-parse per request. Same pattern as
+# _ENABLED_CACHE: short TTL as a safety net for other workers, zeroed by the
+# PluginConfig signal handlers so settings changes apply immediately in the
+# worker that processed the save.
+_CONFIG_CACHE = {'data': None, 'expires': 0.0}
+_CONFIG_CACHE_TTL = 5.0
+
+
 def _get_plugin_config():
     """
-    Get plugin configuration from database.
+    Get plugin configuration (cached snapshot, 5s TTL + signal invalidation).
 
     Returns all plugin settings configured in plugin UI.
     Used by multiple hooks to avoid duplicating config loading code.
@@ -79,6 +123,18 @@ def _get_plugin_config():
             'custom_url_template': str
         }
     """
+    cached = _CONFIG_CACHE
+    now = time.monotonic()
+    if cached['data'] is not None and cached['expires'] > now:
+        return cached['data']
+    data = _load_plugin_config()
+    cached['data'] = data
+    cached['expires'] = now + _CONFIG_CACHE_TTL
+    return data
+
+
+def _load_plugin_config():
+    """Read + parse plugin settings from the database (uncached)."""
     defaults = {
         'timezone': 'Europe/Brussels',
         'language': 'en',
@@ -87,6 +143,7 @@ def _get_plugin_config():
         'custom_url_template': '',
         'warmup_on_enable': True,
         'xmltv_prev_days_override': 0,
+        'async_proxy': False,
     }
     try:
         from apps.plugins.models import PluginConfig
@@ -104,28 +161,128 @@ def _get_plugin_config():
                 'custom_url_template': config.settings.get('custom_url_template', '').strip(),
                 'warmup_on_enable': bool(config.settings.get('warmup_on_enable', True)),
                 'xmltv_prev_days_override': max(0, min(xmltv_override, 30)),
+                'async_proxy': bool(config.settings.get('async_proxy', False)),
             }
     except Exception:
         pass
     return defaults
 
 
+# Short-TTL cache for the enabled flag. The URLResolver patch runs for EVERY
+# incoming request (not just timeshift ones), so a DB round-trip per check is
+# one extra SQL query on every URL resolution site-wide. A 5s TTL collapses
+# that to ~1 query/sec per worker. The PluginConfig post_save/post_delete
+# signal (connected in install_hooks) zeroes 'expires' so toggling the plugin
+# in the UI still takes effect immediately, preserving the hot enable/disable
+# semantics described in the module docstring.
+_ENABLED_CACHE = {'value': False, 'expires': 0.0}
+_ENABLED_CACHE_TTL = 5.0
+
+
 def _is_plugin_enabled():
     """
-    Check if plugin is enabled in database.
+    Check if plugin is enabled in database (cached, 5s TTL).
 
     Called at runtime by each patched function to determine if timeshift
     logic should execute. This enables hot enable/disable without restart.
+    The DB is only consulted when the cache has expired or was invalidated
+    by the PluginConfig signal handler.
 
     Returns:
         bool: True if plugin is enabled, False otherwise
     """
+    cached = _ENABLED_CACHE
+    now = time.monotonic()
+    if cached['expires'] > now:
+        return cached['value']
     try:
         from apps.plugins.models import PluginConfig
         config = PluginConfig.objects.get(key='dispatcharr_timeshift')
-        return config.enabled
+        enabled = config.enabled
     except Exception:
-        return False
+        enabled = False
+    cached['value'] = enabled
+    cached['expires'] = now + _ENABLED_CACHE_TTL
+    return enabled
+
+
+# Serializes signal-triggered re-installs, so a rapid double toggle can't
+# interleave two install passes.
+_patch_state_lock = threading.Lock()
+
+
+def _sync_patch_state(enabled):
+    """
+    Re-install patches when the plugin is toggled on.
+
+    post_save signals are per-process: only the uWSGI worker that handled
+    the toggle request sees them, and a later re-enable may be served by a
+    DIFFERENT worker. Uninstalling on disable would therefore leave the
+    disabling worker permanently unpatched (plugin._hooks_installed stays
+    True, so the keepalive/discovery path never reinstalls) — so on disable
+    the wrappers stay in place and no-op via their per-request
+    _is_plugin_enabled() check, exactly like every worker that never saw
+    the signal. On enable, install_hooks() runs as an idempotent re-sync
+    for this worker; uninstall_hooks() stays reserved for Plugin.stop().
+    """
+    with _patch_state_lock:
+        if enabled:
+            install_hooks()
+
+
+def _on_config_saved(sender=None, instance=None, **kwargs):
+    """
+    Signal handler for PluginConfig post_save.
+
+    Connected in install_hooks() (signals can't be connected at import time —
+    Django apps not ready). Only reacts to our own config row to avoid churn
+    from other plugins. Invalidates the enabled cache, then re-syncs the
+    patches for this worker if the plugin was just enabled.
+    """
+    if getattr(instance, 'key', None) != 'dispatcharr_timeshift':
+        return
+    _ENABLED_CACHE['expires'] = 0.0
+    _CONFIG_CACHE['expires'] = 0.0
+    _sync_patch_state(bool(getattr(instance, 'enabled', False)))
+
+
+def _on_config_deleted(sender=None, instance=None, **kwargs):
+    """Signal handler for PluginConfig post_delete: treat as disabled."""
+    if getattr(instance, 'key', None) != 'dispatcharr_timeshift':
+        return
+    _ENABLED_CACHE['expires'] = 0.0
+    _CONFIG_CACHE['expires'] = 0.0
+    _sync_patch_state(False)
+
+
+def _connect_config_signals():
+    """Connect PluginConfig signals for cache invalidation + patch swapping (idempotent)."""
+    from django.db.models.signals import post_save, post_delete
+    from apps.plugins.models import PluginConfig
+
+    # dispatch_uid makes repeated connects no-ops (install_hooks can run
+    # multiple times per worker, see _patch_xc_get_live_streams guard).
+    post_save.connect(
+        _on_config_saved, sender=PluginConfig,
+        dispatch_uid='dispatcharr_timeshift_config_saved',
+    )
+    post_delete.connect(
+        _on_config_deleted, sender=PluginConfig,
+        dispatch_uid='dispatcharr_timeshift_config_deleted',
+    )
+
+
+def _json_int(value):
+    """
+    int() for text values extracted from JSON via PostgreSQL ->> (lenient).
+
+    ->> returns text or NULL; providers ship tv_archive as int 1, string "1"
+    or garbage. Returns 0 for anything non-numeric.
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
 
 
 _provider_archive_days_cache = {'value': None, 'expires_at': 0}
@@ -168,7 +325,7 @@ def _compute_provider_archive_days():
             if d > max_days:
                 max_days = d
     except Exception as e:
-        logger.warning(f"[Timeshift] Could not compute provider archive days: {e}")
+        logger.warning("[Timeshift] Could not compute provider archive days: %s", e)
         max_days = 0
 
     # Dispatcharr core caps prev_days at 30 (validated on input)
@@ -178,6 +335,84 @@ def _compute_provider_archive_days():
     return max_days
 
 
+def _bind_django_objects():
+    """
+    Bind frequently-used Django/Dispatcharr objects to module globals.
+
+    Called from install_hooks() — model imports would fail at module import
+    time (Django apps not ready), which is why the patched functions
+    historically imported inside their bodies. Binding once here turns
+    those per-call imports into plain global reads on the hot paths.
+    """
+    global _Channel, _Stream, _User, _Prefetch, _RawSQL
+    global _JsonResponse, _get_object_or_404
+
+    from django.db.models import Prefetch
+    from django.db.models.expressions import RawSQL
+    from django.http import JsonResponse
+    from django.shortcuts import get_object_or_404
+    from apps.accounts.models import User
+    from apps.channels.models import Channel, Stream
+
+    _Channel = Channel
+    _Stream = Stream
+    _User = User
+    _Prefetch = Prefetch
+    _RawSQL = RawSQL
+    _JsonResponse = JsonResponse
+    _get_object_or_404 = get_object_or_404
+
+    # Views-side bindings (models used by auth/lookup helpers)
+    from . import views
+    views._bind_django_models()
+
+
+def _middleware_dotted_path():
+    """Dotted path of TimeshiftMiddleware for settings.MIDDLEWARE.
+
+    Computed from the imported module rather than hardcoded, because the
+    package name depends on where Dispatcharr mounts the plugins directory.
+    """
+    from . import middleware
+    return middleware.__name__ + '.TimeshiftMiddleware'
+
+
+def _install_middleware():
+    """
+    Prepend TimeshiftMiddleware to settings.MIDDLEWARE (idempotent).
+
+    Only effective in workers whose middleware chain is built after this
+    runs — that's why _patch_url_resolver() remains installed as fallback.
+
+    Returns:
+        bool: True if the middleware is present in settings, False on error
+    """
+    try:
+        from django.conf import settings
+        path = _middleware_dotted_path()
+        current = list(settings.MIDDLEWARE)
+        if path not in current:
+            settings.MIDDLEWARE = [path] + current
+            logger.info("[Timeshift] Prepended TimeshiftMiddleware to MIDDLEWARE")
+        return True
+    except Exception as e:
+        logger.warning(f"[Timeshift] Middleware insertion failed, relying on URLResolver patch: {e}")
+        return False
+
+
+def _uninstall_middleware():
+    """Remove TimeshiftMiddleware from settings.MIDDLEWARE if present."""
+    try:
+        from django.conf import settings
+        path = _middleware_dotted_path()
+        current = list(settings.MIDDLEWARE)
+        if path in current:
+            settings.MIDDLEWARE = [m for m in current if m != path]
+            logger.info("[Timeshift] Removed TimeshiftMiddleware from MIDDLEWARE")
+    except Exception as e:
+        logger.warning(f"[Timeshift] Could not remove middleware: {e}")
+
+
 def install_hooks():
     """
     Install all timeshift hooks.
@@ -188,10 +423,18 @@ def install_hooks():
     logger.info("[Timeshift] Installing hooks...")
 
     try:
+        _bind_django_objects()
+        _connect_config_signals()
+        from .views import _connect_stream_signals, _connect_user_signals
+        _connect_stream_signals()
+        _connect_user_signals()
         _patch_xc_get_live_streams()
         _patch_stream_xc()
         _patch_xc_get_epg()
         _patch_generate_epg()
+        _install_middleware()
+        # Resolver patch stays as fallback: middleware injection only reaches
+        # workers whose middleware chain is built after settings are modified.
         _patch_url_resolver()
         logger.info("[Timeshift] All hooks installed successfully")
         return True
@@ -212,7 +455,7 @@ def uninstall_hooks():
     """
     global _original_xc_get_live_streams, _original_stream_xc
     global _original_xc_get_epg, _original_generate_epg
-    global _original_url_callbacks, _original_resolve
+    global _patched_url_patterns, _original_resolve
 
     logger.info("[Timeshift] Uninstalling hooks...")
 
@@ -224,17 +467,19 @@ def uninstall_hooks():
             _original_xc_get_live_streams = None
             logger.info("[Timeshift] Restored xc_get_live_streams")
 
-        # 2. Restore stream_xc module function + URL pattern callbacks
+        # 2. Restore stream_xc module function + URL pattern callbacks.
+        # Same module the patch targets (apps.proxy.ts_proxy.views) —
+        # restoring onto apps.proxy.views would leave the wrapper in place.
         if _original_stream_xc:
-            from apps.proxy import views as proxy_views
+            from apps.proxy.ts_proxy import views as proxy_views
             proxy_views.stream_xc = _original_stream_xc
-            # Restore URL pattern callbacks (Django stores references at import time)
+            # Restore URL pattern callbacks (Django stores references at
+            # import time). We kept direct references to the patched pattern
+            # objects, so no rescan of urlpatterns is needed here.
             try:
-                import dispatcharr.urls as main_urls
-                for pattern in main_urls.urlpatterns:
-                    if id(pattern) in _original_url_callbacks:
-                        pattern.callback = _original_url_callbacks[id(pattern)]
-                _original_url_callbacks.clear()
+                for pattern in _patched_url_patterns:
+                    pattern.callback = _original_stream_xc
+                _patched_url_patterns.clear()
             except Exception as e:
                 logger.warning(f"[Timeshift] Could not restore URL callbacks: {e}")
             _original_stream_xc = None
@@ -254,7 +499,11 @@ def uninstall_hooks():
             _original_generate_epg = None
             logger.info("[Timeshift] Restored generate_epg")
 
-        # 5. Restore URLResolver.resolve
+        # 5. Remove middleware from settings (workers with an already-built
+        # chain keep instances, but those check _is_plugin_enabled per request)
+        _uninstall_middleware()
+
+        # 6. Restore URLResolver.resolve
         if _original_resolve:
             from django.urls.resolvers import URLResolver
             URLResolver.resolve = _original_resolve
@@ -306,7 +555,13 @@ def _patch_xc_get_live_streams():
         if not _is_plugin_enabled():
             return streams
 
-        from apps.channels.models import Channel
+        # Prebound by _bind_django_objects() in install_hooks(); fall back to
+        # importing if called before binding (e.g. unit context)
+        Channel, Stream, Prefetch, RawSQL = _Channel, _Stream, _Prefetch, _RawSQL
+        if Channel is None:
+            from django.db.models import Prefetch
+            from django.db.models.expressions import RawSQL
+            from apps.channels.models import Channel, Stream
 
         config = _get_plugin_config()
         debug = config['debug_mode']
@@ -316,63 +571,92 @@ def _patch_xc_get_live_streams():
 
         timeshift_count = 0
 
+        # Bulk fetch all channels + their ordered streams in 2 queries instead
+        # of 2 queries PER stream (2N+1 → 2). For a 500-channel provider this
+        # cuts ~1000 DB round-trips per player_api.php call.
+        #
+        # The loop only needs three scalar keys out of custom_properties, so
+        # extract them server-side with PostgreSQL ->> (Dispatcharr is
+        # Postgres-only) and defer the JSON blob itself — no full-column
+        # transfer and no per-stream JSON decode in Python.
+        # Any DB failure here means we can't enhance anything — return the
+        # original response rather than breaking player_api.php entirely.
+        try:
+            ids = [s.get('stream_id') for s in streams]
+            stream_qs = Stream.objects.order_by('channelstream__order').annotate(
+                tv_archive_raw=RawSQL("(custom_properties->>'tv_archive')", []),
+                tv_archive_duration_raw=RawSQL("(custom_properties->>'tv_archive_duration')", []),
+                provider_sid_raw=RawSQL("(custom_properties->>'stream_id')", []),
+            ).defer('custom_properties')
+            channels_qs = Channel.objects.filter(id__in=ids).prefetch_related(
+                Prefetch('streams', queryset=stream_qs)
+            )
+            by_id = {c.id: c for c in channels_qs}
+        except Exception as e:
+            logger.error("[Timeshift] API: Bulk channel fetch failed, returning unenhanced streams: %s", e)
+            return streams
+
+        # No try/except inside the loop: everything below is dict lookups and
+        # pre-normalized scalars (_json_int), so the happy path carries no
+        # exception-handler setup and real bugs surface instead of being
+        # swallowed per-stream.
         for stream_data in streams:
             original_stream_id = stream_data.get('stream_id')
-            try:
-                channel = Channel.objects.filter(id=original_stream_id).first()
-                if not channel:
-                    if debug:
-                        logger.info(f"[Timeshift] API: Channel not found for internal_id={original_stream_id}")
-                    continue
-
-                # ✅ NEW: Check ALL streams for catch-up support (fallback chain)
-                tv_archive = 0
-                tv_archive_duration = 0
-                catchup_stream = None
-
+            channel = by_id.get(original_stream_id)
+            if not channel:
                 if debug:
-                    logger.info(f"[Timeshift] API: Scanning {channel.name} for catch-up support...")
-
-                for stream in channel.streams.order_by('channelstream__order'):
-                    stream_props = stream.custom_properties or {}
-                    if int(stream_props.get('tv_archive', 0)):
-                        tv_archive = 1
-                        tv_archive_duration = int(stream_props.get('tv_archive_duration', 0))
-                        catchup_stream = stream
-                        if debug:
-                            logger.info(f"[Timeshift] API:   {stream.name}: tv_archive=1 ✅ (duration={tv_archive_duration}d)")
-                        break  # Use first stream with catch-up
-                    else:
-                        if debug:
-                            logger.info(f"[Timeshift] API:   {stream.name}: tv_archive=0")
+                    logger.info(f"[Timeshift] API: Channel not found for internal_id={original_stream_id}")
+                continue
 
-                # Get first stream for provider_stream_id (API response needs it)
-                first_stream = channel.streams.order_by('channelstream__order').first()
-                if not first_stream:
-                    if debug:
-                        logger.info(f"[Timeshift] API: No streams for channel '{channel.name}' (id={original_stream_id})")
-                    continue
+            # Prefetched + ordered by channelstream__order (see Prefetch above)
+            ordered_streams = channel.streams.all()
 
-                props = first_stream.custom_properties or {}
+            # ✅ Check ALL streams for catch-up support (fallback chain)
+            tv_archive = 0
+            tv_archive_duration = 0
+            catchup_stream = None
 
-                # Add tv_archive values (based on ANY stream with catch-up)
-                stream_data['tv_archive'] = tv_archive
-                stream_data['tv_archive_duration'] = tv_archive_duration
+            if debug:
+                logger.info(f"[Timeshift] API: Scanning {channel.name} for catch-up support...")
 
-                if tv_archive:
-                    timeshift_count += 1
+            for stream in ordered_streams:
+                if _json_int(stream.tv_archive_raw):
+                    tv_archive = 1
+                    tv_archive_duration = _json_int(stream.tv_archive_duration_raw)
+                    catchup_stream = stream
                     if debug:
-                        logger.info(f"[Timeshift] API: {channel.name} → tv_archive=1 (from {catchup_stream.name if catchup_stream else 'unknown'}), duration={stream_data['tv_archive_duration']}d")
-
-                # Replace stream_id with provider's stream_id (use first stream for consistency)
-                provider_stream_id = props.get('stream_id')
-                if provider_stream_id:
+                        logger.info(f"[Timeshift] API:   {stream.name}: tv_archive=1 ✅ (duration={tv_archive_duration}d)")
+                    break  # Use first stream with catch-up
+                else:
                     if debug:
-                        logger.info(f"[Timeshift] API: {channel.name} → stream_id {original_stream_id} → {provider_stream_id}")
-                    stream_data['stream_id'] = int(provider_stream_id)
+                        logger.info(f"[Timeshift] API:   {stream.name}: tv_archive=0")
 
-            except Exception as e:
-                logger.error(f"[Timeshift] API: Error enhancing stream internal_id={original_stream_id}: {e}")
+            # Get first stream for provider_stream_id (API response needs it)
+            first_stream = next(iter(ordered_streams), None)
+            if not first_stream:
+                if debug:
+                    logger.info(f"[Timeshift] API: No streams for channel '{channel.name}' (id={original_stream_id})")
+                continue
+
+            # Add tv_archive values (based on ANY stream with catch-up)
+            stream_data['tv_archive'] = tv_archive
+            stream_data['tv_archive_duration'] = tv_archive_duration
+
+            if tv_archive:
+                timeshift_count += 1
+                if debug:
+                    logger.info(f"[Timeshift] API: {channel.name} → tv_archive=1 (from {catchup_stream.name if catchup_stream else 'unknown'}), duration={stream_data['tv_archive_duration']}d")
+
+            # Replace stream_id with provider's stream_id (use first stream
+            # for consistency). NOTE: don't touch first_stream.custom_properties
+            # here — the column is deferred and access would trigger a
+            # per-stream query; the annotation already has the value.
+            # _json_int also shields against non-numeric provider ids.
+            provider_stream_id = _json_int(first_stream.provider_sid_raw)
+            if provider_stream_id:
+                if debug:
+                    logger.info(f"[Timeshift] API: {channel.name} → stream_id {original_stream_id} → {provider_stream_id}")
+                stream_data['stream_id'] = provider_stream_id
 
         if debug and timeshift_count > 0:
             logger.info(f"[Timeshift] API: Enhanced {timeshift_count}/{len(streams)} channels with timeshift")
@@ -404,14 +688,28 @@ def _patch_stream_xc():
         URL patterns keep a reference to the original function from import time.
         We must also update the callback in the urlpatterns list.
     """
-    global _original_stream_xc, _original_url_callbacks
+    global _original_stream_xc, _patched_url_patterns
 
     from apps.proxy.ts_proxy import views as proxy_views
     from dispatcharr import urls as main_urls
+    from .views import _lookup_provider_stream
 
     if getattr(proxy_views.stream_xc, '_is_timeshift_patch', False):
         if _original_stream_xc is None:
             _original_stream_xc = proxy_views.stream_xc._native_func
+        # The module wrapper can outlive a partial uninstall (e.g. fork
+        # inheritance, or a restore that only reached the URL patterns), so
+        # re-point any pattern callbacks that are back on the native function
+        # at the surviving wrapper — otherwise /live/ requests bypass it.
+        native = proxy_views.stream_xc._native_func
+        repatched = [
+            p for p in main_urls.urlpatterns
+            if getattr(p, 'callback', None) is native
+        ]
+        for pattern in repatched:
+            pattern.callback = proxy_views.stream_xc
+            _patched_url_patterns.append(pattern)
+            logger.info(f"[Timeshift] Re-patched URL pattern: {pattern.name}")
         logger.info("[Timeshift] stream_xc already patched, skipping")
         return
 
@@ -422,19 +720,25 @@ def _patch_stream_xc():
         if not _is_plugin_enabled():
             return _original_stream_xc(request, username, password, channel_id)
 
-        import pathlib
-        from django.shortcuts import get_object_or_404
-        from django.http import JsonResponse
-        from apps.accounts.models import User
-        from apps.channels.models import Channel, Stream
+        # Prebound by _bind_django_objects() in install_hooks()
+        User, Channel, Stream = _User, _Channel, _Stream
+        JsonResponse, get_object_or_404 = _JsonResponse, _get_object_or_404
+        if User is None:
+            from django.shortcuts import get_object_or_404
+            from django.http import JsonResponse
+            from apps.accounts.models import User
+            from apps.channels.models import Channel, Stream
 
         config = _get_plugin_config()
         debug = config['debug_mode']
 
         user = get_object_or_404(User, username=username)
 
-        # Extract channel ID without extension (e.g., "12345.ts" -> "12345")
-        channel_id_str = pathlib.Path(channel_id).stem
+        # Extract channel ID without extension (e.g., "12345.ts" -> "12345").
+        # Plain string split instead of pathlib.Path(...).stem — same result
+        # for any extension (.ts/.m3u8), without a PurePath allocation per
+        # request.
+        channel_id_str = channel_id.rsplit('.', 1)[0] if '.' in channel_id else channel_id
 
         if debug:
             logger.info(f"[Timeshift] Live: Request user={username}, channel_id={channel_id_str}")
@@ -446,23 +750,22 @@ def _patch_stream_xc():
                 logger.info(f"[Timeshift] Live: Auth failed - no xc_password for user {username}")
             return JsonResponse({"error": "Invalid credentials"}, status=401)
 
-        if custom_properties["xc_password"] != password:
+        # Constant-time comparison on UTF-8 bytes, same as
+        # views._authenticate_user (compare_digest rejects non-ASCII str).
+        if not hmac.compare_digest(
+                str(custom_properties["xc_password"]).encode('utf-8'),
+                str(password).encode('utf-8')):
             if debug:
                 logger.info(f"[Timeshift] Live: Auth failed - wrong password for user {username}")
             return JsonResponse({"error": "Invalid credentials"}, status=401)
 
-        channel = None
-
         # TIMESHIFT FIX: First try to find by provider stream_id
-        # This handles the case where API returns provider's stream_id
-        stream = Stream.objects.filter(
-            custom_properties__stream_id=channel_id_str,
-            m3u_account__account_type='XC'
-        ).first()
-        if stream:
-            channel = stream.channels.first()
-            if channel and debug:
-                logger.info(f"[Timeshift] Live: Found by provider_stream_id={channel_id_str} → {channel.name}")
+        # This handles the case where API returns provider's stream_id.
+        # Uses the cached provider-id index (views._lookup_provider_stream,
+        # closure-bound at patch time) instead of a JSONField scan per request.
+        channel, _found_stream = _lookup_provider_stream(channel_id_str)
+        if channel and debug:
+            logger.info(f"[Timeshift] Live: Found by provider_stream_id={channel_id_str} → {channel.name}")
 
         # Fall back to original behavior (internal ID lookup)
         if not channel:
@@ -497,7 +800,7 @@ def _patch_stream_xc():
 
         if not channel:
             # Error always logged
-            logger.error(f"[Timeshift] Live: Channel not found for ID={channel_id_str}")
+            logger.error("[Timeshift] Live: Channel not found for ID=%s", channel_id_str)
 
             # Detailed diagnostics only in debug mode (expensive DB queries)
             if debug:
@@ -538,11 +841,12 @@ def _patch_stream_xc():
                 logger.info(f"[Timeshift] Live: Access denied - user_level {user.user_level} < required {channel.user_level}")
             return JsonResponse({"error": "Not found"}, status=404)
 
-        # Call the original stream_ts function
-        from apps.proxy.ts_proxy.views import stream_ts
+        # Call the original stream_ts function — attribute lookup on the
+        # closure-bound module (no per-request import), and still live if
+        # something else patches stream_ts later.
         # Handle both DRF requests and regular Django requests
         actual_request = getattr(request, '_request', request)
-        return stream_ts(actual_request, str(channel.uuid))
+        return proxy_views.stream_ts(actual_request, str(channel.uuid))
 
     # Patch the module (for any new imports)
     patched_stream_xc._is_timeshift_patch = True
@@ -550,13 +854,17 @@ def _patch_stream_xc():
     proxy_views.stream_xc = patched_stream_xc
 
     # CRITICAL: Also patch the URL patterns callbacks
-    # Django keeps references to the original function in urlpatterns
-    # Store original callbacks so we can restore them later
-    for pattern in main_urls.urlpatterns:
-        if hasattr(pattern, 'callback') and pattern.callback == _original_stream_xc:
-            _original_url_callbacks[id(pattern)] = _original_stream_xc
-            pattern.callback = patched_stream_xc
-            logger.info(f"[Timeshift] Patched URL pattern: {pattern.name}")
+    # Django keeps references to the original function in urlpatterns.
+    # One identity-comparison scan at patch time; we keep direct references
+    # to the patched pattern objects so restore is O(patched) with no rescan
+    # (and no id()-keyed dict needed).
+    _patched_url_patterns = [
+        p for p in main_urls.urlpatterns
+        if getattr(p, 'callback', None) is _original_stream_xc
+    ]
+    for pattern in _patched_url_patterns:
+        pattern.callback = patched_stream_xc
+        logger.info(f"[Timeshift] Patched URL pattern: {pattern.name}")
 
     logger.info("[Timeshift] Patched stream_xc for provider stream_id lookup")
 
@@ -585,7 +893,9 @@ def _patch_xc_get_epg():
     """
     global _original_xc_get_epg
 
+    from django.http import Http404
     from apps.output import views as output_views
+    from .views import _lookup_provider_stream, _zoneinfo
 
     def _convert_epg_timestamps_to_local(result, config, debug=False):
         """
@@ -602,10 +912,10 @@ def _patch_xc_get_epg():
             return result
 
         from datetime import datetime, timezone as dt_timezone
-        from zoneinfo import ZoneInfo
 
         timezone_str = config['timezone']
-        local_tz = ZoneInfo(timezone_str)
+        # Cached ZoneInfo (construction reads tzdata files), see views._zoneinfo
+        local_tz = _zoneinfo(timezone_str)
         # Use datetime.timezone.utc instead of ZoneInfo("UTC") because
         # ZoneInfo("UTC") can return wrong offset when /etc/timezone differs
         # from /etc/localtime in Docker containers (v1.2.4 fix).
@@ -643,8 +953,11 @@ def _patch_xc_get_epg():
         if not _is_plugin_enabled():
             return _original_xc_get_epg(request, user, short)
 
-        from django.http import Http404
-        from apps.channels.models import Channel, Stream
+        # Http404/_lookup_provider_stream are closure-bound at patch time;
+        # Channel prebound by _bind_django_objects()
+        Channel = _Channel
+        if Channel is None:
+            from apps.channels.models import Channel
 
         config = _get_plugin_config()
         debug = config['debug_mode']
@@ -661,15 +974,11 @@ def _patch_xc_get_epg():
 
         try:
             # TIMESHIFT FIX: First try to find by provider stream_id
-            # This handles the case where API returns provider's stream_id
-            stream = Stream.objects.filter(
-                custom_properties__stream_id=str(channel_id),
-                m3u_account__account_type='XC'
-            ).first()
-            if stream:
-                channel = stream.channels.first()
-                if channel and debug:
-                    logger.info(f"[Timeshift] EPG: Found by provider_stream_id={channel_id} → {channel.name}")
+            # This handles the case where API returns provider's stream_id.
+            # Cached index lookup, same as stream_xc/timeshift_proxy.
+            channel, _found_stream = _lookup_provider_stream(channel_id)
+            if channel and debug:
+                logger.info(f"[Timeshift] EPG: Found by provider_stream_id={channel_id} → {channel.name}")
 
             # Fall back to original behavior (internal ID lookup)
             if not channel:
@@ -698,7 +1007,7 @@ def _patch_xc_get_epg():
                     logger.info(f"[Timeshift] EPG: Found by internal_id={channel_id} → {channel.name}")
 
             if not channel:
-                logger.error(f"[Timeshift] EPG: Channel not found for stream_id={channel_id}")
+                logger.error("[Timeshift] EPG: Channel not found for stream_id=%s", channel_id)
                 raise Http404()
 
             # ✅ NEW: Find first stream in channel with catch-up support
@@ -733,13 +1042,12 @@ def _patch_xc_get_epg():
                 # CUSTOM EPG RESPONSE: Include past programs for timeshift
                 from datetime import timedelta
                 from django.utils import timezone as django_timezone
-                from zoneinfo import ZoneInfo
                 import base64
 
                 # Get plugin config
                 timezone_str = config['timezone']
                 language = config['language']
-                local_tz = ZoneInfo(timezone_str)
+                local_tz = _zoneinfo(timezone_str)
 
                 archive_duration_days = int(props.get('tv_archive_duration', 7))
                 start_date = django_timezone.now() - timedelta(days=archive_duration_days)
@@ -830,7 +1138,7 @@ def _patch_xc_get_epg():
         except Http404:
             raise
         except Exception as e:
-            logger.error(f"[Timeshift] EPG: Unexpected error for stream_id={channel_id}: {e}", exc_info=True)
+            logger.error("[Timeshift] EPG: Unexpected error for stream_id=%s: %s", channel_id, e, exc_info=True)
             raise Http404()
 
     patched_xc_get_epg._is_timeshift_patch = True
@@ -869,16 +1177,15 @@ def _patch_generate_epg():
             return _original_generate_epg(request, profile_name, user)
 
         try:
-            from zoneinfo import ZoneInfo
             from django.http import StreamingHttpResponse
-            import re
+            from .views import _zoneinfo
 
-            # Get timezone from plugin settings
+            # Get timezone from plugin settings (cached snapshot)
             plugin_config = _get_plugin_config()
             timezone_str = plugin_config['timezone']
             debug = plugin_config['debug_mode']
             xmltv_override = plugin_config['xmltv_prev_days_override']
-            local_tz = ZoneInfo(timezone_str)
+            local_tz = _zoneinfo(timezone_str)
 
             if debug:
                 logger.info(f"[Timeshift] XMLTV: Converting timestamps to {timezone_str}")
@@ -971,7 +1278,7 @@ def _patch_generate_epg():
             return response
 
         except Exception as e:
-            logger.error(f"[Timeshift] XMLTV: Generation error, falling back to original: {e}")
+            logger.error("[Timeshift] XMLTV: Generation error, falling back to original: %s", e)
             return _original_generate_epg(request, profile_name, user)
 
     patched_generate_epg._is_timeshift_patch = True
@@ -1019,21 +1326,37 @@ def _patch_url_resolver():
         logger.info("[Timeshift] URLResolver already patched, skipping")
         return
 
+    from django.urls import get_resolver, ResolverMatch
     from .views import timeshift_proxy
 
-    TIMESHIFT_PATTERN = re.compile(
-        r'^/?timeshift/(?P<username>[^/]+)/(?P<password>[^/]+)/'
-        r'(?P<stream_id>\d+)/(?P<timestamp>[\d\-:]+)/(?P<duration>\d+)\.ts$'
-    )
-
     _original_resolve = current
 
-    def patched_resolve(self, path):
-        # Only intercept if plugin is enabled
-        if _is_plugin_enabled() and (path.startswith('/timeshift/') or path.startswith('timeshift/')):
-            match = TIMESHIFT_PATTERN.match(path)
+    # PERF: resolve() runs for every URL in the project, so the miss path must
+    # be as cheap as possible. Default args bind the globals as locals
+    # (LOAD_FAST instead of LOAD_GLOBAL + dict lookup), and the slice
+    # comparison rejects non-timeshift paths before paying for the
+    # enabled-check or the regex engine.
+    def patched_resolve(self, path,
+                        _orig=_original_resolve,
+                        _enabled=_is_plugin_enabled,
+                        _match=TIMESHIFT_PATTERN.match,
+                        _get_resolver=get_resolver):
+        # Cheap prefix check first: 99%+ of paths are not timeshift URLs.
+        # Accept both "/timeshift/..." and "timeshift/..." (Django strips the
+        # leading slash for nested resolvers).
+        if path[:11] != '/timeshift/' and path[:10] != 'timeshift/':
+            return _orig(self, path)
+        # resolve() recurses into every include()'d sub-resolver, each seeing
+        # a prefix-stripped sub-path. Only the root resolver ever receives the
+        # full request path, so don't intercept (or re-run the regex) for
+        # nested resolvers whose sub-path happens to start with "timeshift/".
+        # get_resolver is lru_cached in Django, so this compares against the
+        # live root even if Django's resolver cache is cleared.
+        if self is not _get_resolver():
+            return _orig(self, path)
+        if _enabled():
+            match = _match(path)
             if match:
-                from django.urls import ResolverMatch
                 config = _get_plugin_config()
                 if config['debug_mode']:
                     logger.info(f"[Timeshift] URL intercepted: {path}")
@@ -1043,7 +1366,7 @@ def _patch_url_resolver():
                     match.groupdict(),
                     route=path,
                 )
-        return _original_resolve(self, path)
+        return _orig(self, path)
 
     patched_resolve._is_timeshift_patch = True
     patched_resolve._native_func = _original_resolve
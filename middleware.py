@@ -0,0 +1,56 @@
+"""
+Dispatcharr Timeshift Plugin - Middleware
+
+Intercepts /timeshift/ requests BEFORE URL resolution so that non-timeshift
+traffic never pays the interception cost in URLResolver.resolve.
+
+WHY MIDDLEWARE NOW (hooks.py docstring says it FAILED)?
+    The original middleware attempt failed because it relied on URL pattern
+    injection happening first — the catch-all pattern had already matched.
+    A __call__-style middleware that SHORT-CIRCUITS with a response never
+    reaches URL resolution at all: get_response() is what triggers resolve(),
+    and we only call it for non-timeshift paths.
+
+REGISTRATION:
+    install_hooks() prepends this class to settings.MIDDLEWARE. Django builds
+    each worker's middleware chain when its WSGI handler is created, so the
+    injection only takes effect in workers whose handler is built AFTER plugin
+    discovery. Workers with an already-built chain are covered by the
+    URLResolver.resolve fallback patch (see _patch_url_resolver), which stays
+    installed but is skipped here first whenever this middleware is active.
+
+GitHub: https://github.com/cedric-marcoux/dispatcharr_timeshift
+"""
+
+import logging
+
+from .hooks import TIMESHIFT_PATTERN, _is_plugin_enabled, _get_plugin_config
+
+logger = logging.getLogger("plugins.dispatcharr_timeshift.middleware")
+
+
+class TimeshiftMiddleware:
+    """
+    Short-circuit /timeshift/ requests to timeshift_proxy before resolution.
+
+    All other requests pass straight through to get_response() — the only
+    cost for non-timeshift traffic is one string-prefix comparison.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        logger.info("[Timeshift] Middleware active in this worker")
+
+    def __call__(self, request):
+        path = request.path_info
+        if path[:11] == '/timeshift/' and _is_plugin_enabled():
+            match = TIMESHIFT_PATTERN.match(path)
+            if match:
+                # Deferred import: views pulls in requests/zoneinfo, keep
+                # middleware construction cheap and avoid import cycles.
+                from .views import timeshift_proxy
+
+                if _get_plugin_config()['debug_mode']:
+                    logger.info(f"[Timeshift] Middleware intercepted: {path}")
+                return timeshift_proxy(request, **match.groupdict())
+        return self.get_response(request)
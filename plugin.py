@@ -395,6 +395,20 @@ class Plugin:
                     "first channel is played by any client)."
                 )
             },
+            {
+                "id": "async_proxy",
+                "type": "boolean",
+                "label": "Async proxy (experimental, ASGI only)",
+                "default": False,
+                "help_text": (
+                    "Stream timeshift content via an async httpx client so the worker thread "
+                    "is released between chunks (requires the httpx package and an ASGI "
+                    "deployment). Disables the Format A/B auto-detect fallback and partial-"
+                    "content status propagation — set an explicit Catchup URL Format when "
+                    "enabling this. Do not enable under standard uWSGI/WSGI: the setting "
+                    "is ignored there and the sync proxy is used."
+                )
+            },
             {
                 "id": "url_format",
                 "type": "select",
@@ -31,19 +31,252 @@ AUTHENTICATION:
 GitHub: https://github.com/cedric-marcoux/dispatcharr_timeshift
 """
 
+import hmac
+import time
 import logging
+import functools
 import requests
-from datetime import datetime
+from datetime import datetime, timezone as dt_timezone
 from zoneinfo import ZoneInfo
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.http import StreamingHttpResponse, Http404, HttpResponseBadRequest, HttpResponseForbidden
 
+# Safe one-way import: hooks.py only pulls stdlib at module level and imports
+# this module lazily inside functions, so no circularity.
+from .hooks import _get_plugin_config
+
+# Optional: async proxy path (experimental, opt-in via plugin settings).
+# httpx is not a Dispatcharr dependency, so its absence must be harmless.
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 logger = logging.getLogger("plugins.dispatcharr_timeshift.views")
 
+# Model classes prebound by _bind_django_models() (called from
+# hooks.install_hooks, once Django apps are ready). Per-call
+# `from apps... import` statements still execute a _find_and_load check and
+# attribute binding each time; prebound globals are a plain dict read.
+# None until bound — helpers fall back to importing locally.
+_Channel = None
+_Stream = None
+_User = None
+
+
+def _bind_django_models():
+    """Bind model classes used by the hot helpers (called from install_hooks)."""
+    global _Channel, _Stream, _User
+    from apps.accounts.models import User
+    from apps.channels.models import Channel, Stream
+    _Channel = Channel
+    _Stream = Stream
+    _User = User
+
+# Use datetime.timezone.utc instead of ZoneInfo("UTC") because ZoneInfo("UTC")
+# can return wrong offset when /etc/timezone differs from /etc/localtime
+# (common in Docker containers, v1.2.4 fix).
+_UTC = dt_timezone.utc
+
+
+@functools.lru_cache(maxsize=8)
+def _zoneinfo(timezone_str):
+    """ZoneInfo cached per tz name — construction reads tzdata files."""
+    return ZoneInfo(timezone_str)
+
+# Persistent session shared by all timeshift requests in this worker.
+# Keep-alive pooling means repeat requests to the same provider (seeks,
+# multiple viewers on the same catchup URL) reuse an open socket instead of
+# paying a fresh TCP + TLS handshake each time. No retries: a failed upstream
+# request should surface immediately, the format A→B fallback handles the
+# provider-specific cases.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=128, max_retries=Retry(total=0))
+_SESSION.mount('http://', _adapter)
+_SESSION.mount('https://', _adapter)
+
+# Lazily-created httpx.AsyncClient for the async proxy path (see
+# _proxy_stream_async). Created on first use so WSGI deployments that never
+# enable the async path pay nothing. Sharing one client is safe only
+# because an ASGI worker runs a single event loop and the async path is
+# never taken under WSGI (timeshift_proxy gates on request.scope).
+_ASYNC_CLIENT = None
+
+
+def _get_async_client():
+    """Return the shared httpx.AsyncClient, creating it on first use."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        _ASYNC_CLIENT = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=32),
+        )
+    return _ASYNC_CLIENT
+
 # Cache for URL format preferences per m3u_account
 # Key: m3u_account.id, Value: 'A' (query string) or 'B' (path-based)
 # This is session-scoped (cleared on restart) - no persistence needed
 _url_format_cache = {}
 
+# Cache of whether the provider honours Range requests, per timeshift URL.
+# iPlayTV opens with "Range: bytes=0-" then seeks with fresh Range requests;
+# if the provider ignores Range it restarts the whole TS stream on every
+# seek. Learned passively from responses where we forwarded a *non-trivial*
+# Range (206 = supported, 200 = ignored; "bytes=0-" proves nothing, many
+# providers answer it with 200 yet honour real seeks) — metadata about the
+# stream, not the stream itself. Keyed (m3u_account_id, url) so the same
+# catch-up window (stream_id + starttime are in the URL) reuses the verdict.
+# Keys embed the full provider URL (credentials included), so expired
+# entries are pruned on every insert rather than left to accumulate for the
+# worker's lifetime.
+# Key: (m3u_account_id, url), Value: {'supported': bool, 'expires_at': ts}
+_range_support_cache = {}
+_RANGE_SUPPORT_TTL = 60
+
+# Response headers copied back to the client for seek support:
+# Content-Range tells the client which bytes are being sent,
+# Accept-Ranges tells it that seeking is supported.
+# Fixed tuple bound once instead of a fresh list per request.
+_FORWARD_HEADERS = ('Content-Length', 'Content-Range', 'Accept-Ranges')
+
+# Index of provider stream_id (str) -> (channel_id, stream_id) for XC streams.
+# The JSONField lookup custom_properties__stream_id=... is a sequential scan
+# on PostgreSQL (no index without a dedicated expression index on
+# (custom_properties->>'stream_id')), and it runs on every live-stream AND
+# timeshift request. Built lazily in one query, 5-minute TTL (same pattern as
+# _provider_archive_days_cache in hooks.py) plus Stream post_save/post_delete
+# invalidation so M3U syncs that fire signals refresh it immediately.
+_provider_id_cache = {'map': None, 'expires_at': 0}
+_PROVIDER_ID_CACHE_TTL = 300
+
+
+def _invalidate_provider_id_cache(sender=None, instance=None, **kwargs):
+    """Signal handler: drop the provider stream_id index (rebuilt lazily)."""
+    _provider_id_cache['map'] = None
+    _provider_id_cache['expires_at'] = 0
+
+
+def _connect_stream_signals():
+    """Connect Stream signals for provider-id cache invalidation (idempotent).
+
+    Called from install_hooks() — signals can't be connected at import time.
+    """
+    from django.db.models.signals import post_save, post_delete
+    from apps.channels.models import Stream
+
+    post_save.connect(
+        _invalidate_provider_id_cache, sender=Stream,
+        dispatch_uid='dispatcharr_timeshift_provider_id_cache',
+    )
+    post_delete.connect(
+        _invalidate_provider_id_cache, sender=Stream,
+        dispatch_uid='dispatcharr_timeshift_provider_id_cache_delete',
+    )
+
+
+# Credential cache: username -> {'user': values-dict, 'expires_at': ts}.
+# A client seeking through a programme fires many timeshift requests in quick
+# succession; the 30s TTL lets repeats skip the User query entirely. User
+# post_save/post_delete signals evict, so password changes apply immediately.
+# Failed lookups are NOT cached (no negative-cache poisoning for typo'd names).
+_auth_cache = {}
+_AUTH_CACHE_TTL = 30
+
+
+def _invalidate_auth_cache(sender=None, instance=None, **kwargs):
+    """Signal handler: evict a user's cached credentials on save/delete."""
+    _auth_cache.pop(getattr(instance, 'username', None), None)
+
+
+def _connect_user_signals():
+    """Connect User signals for auth cache eviction (idempotent).
+
+    Called from install_hooks() — signals can't be connected at import time.
+    """
+    from django.db.models.signals import post_save, post_delete
+    from apps.accounts.models import User
+
+    post_save.connect(
+        _invalidate_auth_cache, sender=User,
+        dispatch_uid='dispatcharr_timeshift_auth_cache',
+    )
+    post_delete.connect(
+        _invalidate_auth_cache, sender=User,
+        dispatch_uid='dispatcharr_timeshift_auth_cache_delete',
+    )
+
+
+def _get_provider_id_map():
+    """
+    Build/return the provider stream_id index (one query, cached).
+
+    Returns:
+        dict: {provider_stream_id (str): (channel_id, stream_id)}.
+              Streams without an assigned channel are skipped (they can't
+              serve a request anyway); first channel wins for multi-channel
+              streams, matching the stream.channels.first() behavior.
+    """
+    now = time.time()
+    cached = _provider_id_cache
+    if cached['map'] is not None and cached['expires_at'] > now:
+        return cached['map']
+
+    Stream = _Stream
+    if Stream is None:
+        from apps.channels.models import Stream
+
+    mapping = {}
+    rows = Stream.objects.filter(
+        m3u_account__account_type='XC'
+    ).values('id', 'custom_properties', 'channels__id')
+    for row in rows:
+        if row['channels__id'] is None:
+            continue
+        sid = (row['custom_properties'] or {}).get('stream_id')
+        if sid is None:
+            continue
+        mapping.setdefault(str(sid), (row['channels__id'], row['id']))
+
+    cached['map'] = mapping
+    cached['expires_at'] = now + _PROVIDER_ID_CACHE_TTL
+    return mapping
+
+
+def _lookup_provider_stream(provider_stream_id):
+    """
+    Resolve a provider stream_id to (Channel, Stream).
+
+    Cache hit: two indexed pk lookups. Cache miss (new stream, stale entry):
+    falls back to the JSONField containment query. No logging here — callers
+    decide whether a miss is an error (it isn't for stream_xc, which falls
+    back to internal-ID lookup).
+
+    Returns:
+        Tuple (Channel or None, Stream or None). Stream may be set with
+        Channel None when a stream matched but has no channel assigned.
+    """
+    Channel, Stream = _Channel, _Stream
+    if Channel is None:
+        from apps.channels.models import Channel, Stream
+
+    key = str(provider_stream_id)
+    hit = _get_provider_id_map().get(key)
+    if hit:
+        channel = Channel.objects.filter(id=hit[0]).first()
+        stream = Stream.objects.filter(id=hit[1]).first()
+        if channel and stream:
+            return channel, stream
+        # Stale entry (channel/stream deleted since the index was built):
+        # fall through to the authoritative DB query.
+
+    stream = Stream.objects.filter(
+        custom_properties__stream_id=key,
+        m3u_account__account_type='XC'
+    ).first()
+    channel = stream.channels.first() if stream else None
+    return channel, stream
+
 
 def _get_programme_duration(channel, timestamp_str):
     """
@@ -117,6 +350,19 @@ def _build_timeshift_url_format_b(m3u_account, stream_id, timestamp, duration_mi
     )
 
 
+@functools.lru_cache(maxsize=32)
+def _template_uses_start_unix(template):
+    """
+    Check (once per distinct template) whether it references {start_unix}.
+
+    Computing start_unix needs a strptime + ZoneInfo conversion per request,
+    which is wasted work for the vast majority of custom templates that only
+    use {timestamp}. The template string only changes when the admin edits
+    plugin settings, so an lru_cache on the raw string makes this a dict hit.
+    """
+    return '{start_unix}' in template
+
+
 def timeshift_proxy(request, username, password, stream_id, timestamp, duration):
     """
     Proxy timeshift request to Xtream Codes provider.
@@ -131,11 +377,11 @@ def timeshift_proxy(request, username, password, stream_id, timestamp, duration)
     Returns:
         StreamingHttpResponse proxying the video stream from provider
     """
-    from .hooks import _get_plugin_config
-
     # QUIRK: The "duration" param is actually the provider's stream_id
     # See module docstring for explanation of iPlayTV's URL format
-    provider_stream_id = duration.rstrip('.ts')
+    # removesuffix, NOT rstrip: rstrip('.ts') strips any trailing '.', 't'
+    # or 's' characters, so an ID like "223t" would be mangled to "223".
+    provider_stream_id = duration.removesuffix('.ts')
 
     # Load plugin config
     config = _get_plugin_config()
@@ -165,8 +411,8 @@ def timeshift_proxy(request, username, password, stream_id, timestamp, duration)
         logger.info(f"[Timeshift] Channel found: {channel.name} (id={channel.id})")
 
     # Step 3: Verify user has access to this channel
-    if user.user_level < channel.user_level:
-        logger.error(f"[Timeshift] Access denied: user {username} (level {user.user_level}) < channel {channel.name} (level {channel.user_level})")
+    if user['user_level'] < channel.user_level:
+        logger.error("[Timeshift] Access denied: user %s (level %s) < channel %s (level %s)", username, user['user_level'], channel.name, channel.user_level)
         return HttpResponseForbidden("Access denied")
 
     # Step 4: Check if stream supports catch-up, or find fallback in channel.
@@ -193,7 +439,7 @@ def timeshift_proxy(request, username, password, stream_id, timestamp, duration)
                 break
 
         if not catchup_stream:
-            logger.error(f"[Timeshift] No catch-up stream available in channel {channel.name}")
+            logger.error("[Timeshift] No catch-up stream available in channel %s", channel.name)
             return HttpResponseBadRequest("Timeshift not supported for this channel")
 
     if debug:
@@ -203,7 +449,7 @@ def timeshift_proxy(request, username, password, stream_id, timestamp, duration)
     # Step 5: Verify it's an Xtream Codes provider
     m3u_account = catchup_stream.m3u_account
     if not m3u_account or m3u_account.account_type != 'XC':
-        logger.error(f"[Timeshift] Selected stream {catchup_stream.name} is not from XC provider")
+        logger.error("[Timeshift] Selected stream %s is not from XC provider", catchup_stream.name)
         return HttpResponseBadRequest("Channel not from Xtream Codes provider")
 
     # Step 6: Convert timestamp from UTC to provider's local timezone
@@ -223,13 +469,15 @@ def timeshift_proxy(request, username, password, stream_id, timestamp, duration)
 
     if url_format == 'custom' and custom_template:
         # Custom template - provide all available variables
-        try:
-            # Parse local timestamp to Unix epoch for providers that use it
-            local_dt = datetime.strptime(local_timestamp, "%Y-%m-%d:%H-%M")
-            local_dt = local_dt.replace(tzinfo=ZoneInfo(timezone_str))
-            start_unix = int(local_dt.timestamp())
-        except Exception:
-            start_unix = 0
+        start_unix = 0
+        if _template_uses_start_unix(custom_template):
+            try:
+                # Parse local timestamp to Unix epoch for providers that use it
+                local_dt = datetime.strptime(local_timestamp, "%Y-%m-%d:%H-%M")
+                local_dt = local_dt.replace(tzinfo=_zoneinfo(timezone_str))
+                start_unix = int(local_dt.timestamp())
+            except Exception:
+                start_unix = 0
 
         timeshift_url = custom_template.format(
             server_url=m3u_account.server_url.rstrip('/'),
@@ -277,12 +525,21 @@ def timeshift_proxy(request, username, password, stream_id, timestamp, duration)
 
     # Minimal log in normal mode - just channel name and timestamp
     if not debug:
-        logger.info(f"[Timeshift] {channel.name} @ {local_timestamp}")
+        logger.info("[Timeshift] %s @ %s", channel.name, local_timestamp)
 
     # Step 8: Get User-Agent from M3U account settings
     user_agent = m3u_account.get_user_agent().user_agent
 
-    # Step 9: Proxy the stream (with fallback support)
+    # Step 9: Proxy the stream (with fallback support).
+    # The async path (opt-in, needs httpx + ASGI) frees the worker thread
+    # between chunks; see _proxy_stream_async for its limitations. Gated on
+    # an actual ASGI request (only ASGIRequest carries .scope): under WSGI
+    # Django would drive the async iterator through async_to_sync in fresh
+    # event loops, and the shared AsyncClient's connections would span
+    # loops and fail — so WSGI always takes the sync proxy, whatever the
+    # setting says.
+    if config['async_proxy'] and httpx is not None and hasattr(request, 'scope'):
+        return _proxy_stream_async(request, timeshift_url, user_agent, debug)
     return _proxy_stream(request, timeshift_url, user_agent, fallback_url, m3u_account.id, debug)
 
 
@@ -294,24 +551,46 @@ def _authenticate_user(username, password):
     separate from the Django auth password. This allows different passwords
     for web UI vs IPTV clients.
 
+    Fetches only the three columns we need via .values() instead of
+    instantiating a full User model — timeshift_proxy only reads user_level,
+    so the full ORM object (and its deferred-field machinery) is wasted work
+    on every request. Lookups are cached for 30s (signal-evicted on user
+    save/delete) and the password check is constant-time.
+
     Returns:
-        User object if authenticated, None otherwise
+        dict with 'id', 'user_level', 'custom_properties' if authenticated,
+        None otherwise
     """
-    from apps.accounts.models import User
-
-    try:
-        user = User.objects.get(username=username)
-        xc_password = (user.custom_properties or {}).get('xc_password')
-        if not xc_password:
-            logger.error(f"[Timeshift] Auth failed: user '{username}' has no xc_password")
-            return None
-        if xc_password != password:
-            logger.error(f"[Timeshift] Auth failed: wrong password for user '{username}'")
-            return None
-        return user
-    except User.DoesNotExist:
-        logger.error(f"[Timeshift] Auth failed: user '{username}' does not exist")
+    User = _User
+    if User is None:
+        from apps.accounts.models import User
+
+    now = time.time()
+    entry = _auth_cache.get(username)
+    if entry is not None and entry['expires_at'] > now:
+        user = entry['user']
+    else:
+        user = User.objects.filter(username=username).values(
+            'id', 'user_level', 'custom_properties'
+        ).first()
+        if user is not None:
+            _auth_cache[username] = {'user': user, 'expires_at': now + _AUTH_CACHE_TTL}
+    if user is None:
+        logger.error("[Timeshift] Auth failed: user '%s' does not exist", username)
+        return None
+    xc_password = (user['custom_properties'] or {}).get('xc_password')
+    if not xc_password:
+        logger.error("[Timeshift] Auth failed: user '%s' has no xc_password", username)
+        return None
+    # compare_digest: constant-time, no early-exit timing leak on the shared
+    # secret. Compare UTF-8 bytes — compare_digest raises TypeError on str
+    # inputs containing non-ASCII characters, and both the URL-decoded
+    # password and the admin-set xc_password are free-form text.
+    if not hmac.compare_digest(str(xc_password).encode('utf-8'),
+                               str(password).encode('utf-8')):
+        logger.error("[Timeshift] Auth failed: wrong password for user '%s'", username)
         return None
+    return user
 
 
 def _find_channel_by_provider_stream_id(provider_stream_id):
@@ -325,23 +604,16 @@ def _find_channel_by_provider_stream_id(provider_stream_id):
     Returns:
         Tuple of (Channel, Stream) if found, (None, None) otherwise
     """
-    from apps.channels.models import Stream
-
-    # Search for stream where custom_properties.stream_id matches
-    # Only look at XC provider streams
-    stream = Stream.objects.filter(
-        custom_properties__stream_id=str(provider_stream_id),
-        m3u_account__account_type='XC'
-    ).first()
+    # O(1) dict hit on the cached index in the common case, JSONField query
+    # only on cache misses (see _lookup_provider_stream)
+    channel, stream = _lookup_provider_stream(provider_stream_id)
 
+    if channel:
+        return channel, stream
     if stream:
-        channel = stream.channels.first()
-        if channel:
-            return channel, stream
-        else:
-            logger.error(f"[Timeshift] Stream found but no channel for provider_stream_id={provider_stream_id}")
+        logger.error("[Timeshift] Stream found but no channel for provider_stream_id=%s", provider_stream_id)
     else:
-        logger.error(f"[Timeshift] Channel not found: provider_stream_id={provider_stream_id}")
+        logger.error("[Timeshift] Channel not found: provider_stream_id=%s", provider_stream_id)
 
     return None, None
 
@@ -367,23 +639,46 @@ def _proxy_stream(request, url, user_agent, fallback_url=None, m3u_account_id=No
     Returns:
         StreamingHttpResponse with video content (status 200 or 206)
     """
-    headers = {
-        'User-Agent': user_agent
-    }
-
-    # Forward Range header for seek support
+    # Forward Range header for seek support (single META lookup)
     # Without this, seeking in iPlayTV would fail
     range_header = request.META.get('HTTP_RANGE')
+    # "bytes=0-" is the full-content Range iPlayTV opens every session with;
+    # a 200 answer to it proves nothing about seek support, so only real
+    # (non-trivial) ranges consult or feed the support cache.
+    nontrivial_range = bool(range_header) and range_header != 'bytes=0-'
+    if nontrivial_range:
+        # Skip forwarding Range to providers known to ignore it — they
+        # restart the full stream either way, and some return errors for
+        # Range requests they don't understand.
+        cached = _range_support_cache.get((m3u_account_id, url))
+        if cached and cached['expires_at'] > time.time() and not cached['supported']:
+            if debug:
+                logger.info(f"[Timeshift] Provider ignores Range (cached), sending plain GET")
+            range_header = None
+            nontrivial_range = False
     if range_header:
-        headers['Range'] = range_header
+        headers = {
+            'User-Agent': user_agent,
+            # MPEG-TS doesn't compress; asking for identity stops the provider
+            # from wasting CPU gzipping video and us from gunzipping it.
+            'Accept-Encoding': 'identity',
+            'Range': range_header,
+        }
         if debug:
             logger.info(f"[Timeshift] Forwarding Range header: {range_header}")
+    else:
+        headers = {
+            'User-Agent': user_agent,
+            'Accept-Encoding': 'identity',
+        }
 
     if debug:
         logger.info(f"[Timeshift] Request headers: {headers}")
 
     try:
-        response = requests.get(url, headers=headers, stream=True, timeout=10)
+        # (connect, read) timeouts: fail fast on unreachable providers, but
+        # allow slow chunk delivery once streaming (read timeout is per-read).
+        response = _SESSION.get(url, headers=headers, stream=True, timeout=(5, 30))
 
         if debug:
             logger.info(f"[Timeshift] Provider response: status={response.status_code}")
@@ -394,7 +689,7 @@ def _proxy_stream(request, url, user_agent, fallback_url=None, m3u_account_id=No
                 logger.info(f"[Timeshift] Format A returned 400, trying Format B...")
             response.close()
 
-            response = requests.get(fallback_url, headers=headers, stream=True, timeout=10)
+            response = _SESSION.get(fallback_url, headers=headers, stream=True, timeout=(5, 30))
 
             if debug:
                 logger.info(f"[Timeshift] Fallback response: status={response.status_code}")
@@ -412,13 +707,40 @@ def _proxy_stream(request, url, user_agent, fallback_url=None, m3u_account_id=No
                 body_preview = response.text[:200] if response.text else 'empty'
             except Exception:
                 body_preview = 'unreadable'
-            logger.error(f"[Timeshift] Provider error: status={response.status_code}, "
-                        f"content-type={response.headers.get('Content-Type', 'unknown')}, "
-                        f"body={body_preview}")
+            logger.error("[Timeshift] Provider error: status=%s, content-type=%s, body=%s",
+                         response.status_code,
+                         response.headers.get('Content-Type', 'unknown'),
+                         body_preview)
             return HttpResponseBadRequest(f"Provider error: {response.status_code}")
 
+        # Record the Range verdict: 206 means the provider honoured it,
+        # 200 despite a forwarded non-trivial Range means it was ignored.
+        if nontrivial_range:
+            now = time.time()
+            # Prune dead entries on insert so the cache stays bounded by
+            # concurrent seek sessions (see _range_support_cache).
+            expired = [k for k, v in _range_support_cache.items()
+                       if v['expires_at'] <= now]
+            for key in expired:
+                del _range_support_cache[key]
+            _range_support_cache[(m3u_account_id, url)] = {
+                'supported': response.status_code == 206,
+                'expires_at': now + _RANGE_SUPPORT_TTL,
+            }
+
+        # Read straight from the urllib3 raw stream in 64 KiB chunks.
+        # iter_content(8192) allocated ~76 bytes objects/sec for a 5 Mbps
+        # stream and ran every chunk through urllib3's decode layer; raw
+        # reads with decode_content=False skip that entirely (the payload
+        # is MPEG-TS, there is nothing to decode).
+        response.raw.decode_content = False
+
         def stream_generator():
-            for chunk in response.iter_content(chunk_size=8192):
+            read = response.raw.read
+            while True:
+                chunk = read(65536)
+                if not chunk:
+                    break
                 yield chunk
 
         streaming_response = StreamingHttpResponse(
@@ -427,12 +749,15 @@ def _proxy_stream(request, url, user_agent, fallback_url=None, m3u_account_id=No
             status=response.status_code
         )
 
-        # Copy headers needed for seek support
-        # Content-Range tells client which bytes are being sent
-        # Accept-Ranges tells client that seeking is supported
-        for header in ['Content-Length', 'Content-Range', 'Accept-Ranges']:
-            if header in response.headers:
-                streaming_response[header] = response.headers[header]
+        # Copy headers needed for seek support (see _FORWARD_HEADERS).
+        # response.raw.headers is urllib3's HTTPHeaderDict — direct lookups,
+        # cheaper than requests' CaseInsensitiveDict wrapper, and one .get
+        # instead of a contains-then-getitem pair per header.
+        raw_headers = response.raw.headers
+        for header in _FORWARD_HEADERS:
+            value = raw_headers.get(header)
+            if value:
+                streaming_response[header] = value
 
         if debug:
             logger.info(f"[Timeshift] Streaming started: status={response.status_code}, "
@@ -442,16 +767,73 @@ def _proxy_stream(request, url, user_agent, fallback_url=None, m3u_account_id=No
         return streaming_response
 
     except requests.exceptions.Timeout:
-        logger.error(f"[Timeshift] Provider timeout after 10s")
+        logger.error("[Timeshift] Provider timeout")
         return HttpResponseBadRequest("Provider timeout")
     except requests.exceptions.ConnectionError as e:
-        logger.error(f"[Timeshift] Provider connection error: {e}")
+        logger.error("[Timeshift] Provider connection error: %s", e)
         return HttpResponseBadRequest("Provider connection error")
     except requests.exceptions.RequestException as e:
-        logger.error(f"[Timeshift] Provider request error: {e}")
+        logger.error("[Timeshift] Provider request error: %s", e)
         return HttpResponseBadRequest("Provider connection error")
 
 
+def _proxy_stream_async(request, url, user_agent, debug=False):
+    """
+    Async variant of _proxy_stream (experimental, opt-in).
+
+    A sync proxy holds a WSGI worker thread for the entire playback session —
+    potentially hours. Under an ASGI deployment (Django 4.2+ supports async
+    iterators in StreamingHttpResponse), this variant releases the thread
+    between chunks so one worker can multiplex many concurrent streams.
+
+    LIMITATIONS (why it's opt-in):
+        - No format A→B fallback: the upstream response is only inspected
+          inside the async iterator, after the response object is built.
+          Use an explicit url_format setting with the async path.
+        - No 206/Content-Range propagation for the same reason; the client's
+          Range header is still forwarded upstream, so seeks deliver the
+          right bytes, but the response status is always 200.
+        - ASGI only — must NOT run under WSGI. There Django pumps the async
+          iterator through async_to_sync, each pull in a fresh event loop,
+          so the shared AsyncClient's stream context and keep-alive
+          connections span loops and fail. timeshift_proxy gates on
+          request.scope (ASGI requests only) before choosing this path.
+
+    Returns:
+        StreamingHttpResponse with an async chunk iterator
+    """
+    headers = {
+        'User-Agent': user_agent,
+        'Accept-Encoding': 'identity',
+    }
+    range_header = request.META.get('HTTP_RANGE')
+    if range_header:
+        headers['Range'] = range_header
+        if debug:
+            logger.info(f"[Timeshift] Async: Forwarding Range header: {range_header}")
+
+    async def stream_chunks():
+        client = _get_async_client()
+        try:
+            async with client.stream('GET', url, headers=headers) as upstream:
+                if upstream.status_code not in (200, 206):
+                    logger.error("[Timeshift] Async: Provider error: status=%s", upstream.status_code)
+                    return
+                async for chunk in upstream.aiter_bytes(65536):
+                    yield chunk
+        except httpx.HTTPError as e:
+            logger.error("[Timeshift] Async: Provider request error: %s", e)
+
+    streaming_response = StreamingHttpResponse(
+        stream_chunks(),
+        content_type='video/mp2t',
+    )
+    streaming_response['Accept-Ranges'] = 'bytes'
+    if debug:
+        logger.info(f"[Timeshift] Async: Streaming started")
+    return streaming_response
+
+
 def _get_plugin_timezone():
     """
     Get configured timezone from plugin settings.
@@ -465,7 +847,7 @@ def _get_plugin_timezone():
         if config and config.settings:
             return config.settings.get('timezone', 'Europe/Brussels')
     except Exception as e:
-        logger.debug(f"[Timeshift] Could not load timezone setting: {e}")
+        logger.debug("[Timeshift] Could not load timezone setting: %s", e)
     return "Europe/Brussels"
 
 
@@ -484,18 +866,21 @@ def _convert_timestamp_to_local(timestamp, timezone_str):
         str: Converted timestamp in same format, or original if conversion fails
     """
     try:
-        # Parse: YYYY-MM-DD:HH-MM
-        utc_time = datetime.strptime(timestamp, "%Y-%m-%d:%H-%M")
-        # Use datetime.timezone.utc instead of ZoneInfo("UTC") because
-        # ZoneInfo("UTC") can return wrong offset when /etc/timezone differs
-        # from /etc/localtime (common in Docker containers).
-        # See: Python reads /etc/timezone → CET, corrupting ZoneInfo("UTC").
-        from datetime import timezone as dt_timezone
-        utc_time = utc_time.replace(tzinfo=dt_timezone.utc)
-
-        # Convert to target timezone
-        local_time = utc_time.astimezone(ZoneInfo(timezone_str))
-        return local_time.strftime("%Y-%m-%d:%H-%M")
+        # Parse "YYYY-MM-DD:HH-MM" by slicing: the format is fixed, so this
+        # skips the locale-aware strptime state machine (~5-10µs per call,
+        # once per timeshift request). Bad input still raises ValueError and
+        # falls through to the original-timestamp fallback below.
+        utc_time = datetime(
+            int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+            int(timestamp[11:13]), int(timestamp[14:16]), tzinfo=_UTC,
+        )
+
+        # Convert to target timezone (cached ZoneInfo, see _zoneinfo)
+        local = utc_time.astimezone(_zoneinfo(timezone_str))
+        return (
+            f"{local.year:04d}-{local.month:02d}-{local.day:02d}"
+            f":{local.hour:02d}-{local.minute:02d}"
+        )
     except Exception as e:
-        logger.error(f"[Timeshift] Timestamp conversion failed for '{timestamp}': {e}")
+        logger.error("[Timeshift] Timestamp conversion failed for '%s': %s", timestamp, e)
         return timestamp